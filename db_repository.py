@@ -1,13 +1,59 @@
 # db_repository.py
+import functools
+import logging
 import sys
 import boto3
+import botocore.config
 from botocore.exceptions import ClientError
-from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeSerializer
 from typing import List, Dict, Any, Optional
 
 # DynamoDB constants
 DYNAMO_TABLE_NAME = "TournamentTable"
 CONFIG_SK = "CONFIG"
+STATUS_INDEX_NAME = "StatusIndex"
+
+logger = logging.getLogger(__name__)
+
+
+def status_index_attrs(pk: str, status: str, round_number: int, sk: str) -> Dict[str, str]:
+    """
+    GSI attributes for StatusIndex. Every write that sets or changes a
+    match's status must include these so the index stays consistent.
+    """
+    return {
+        "status_pk": f"{pk}#{status}",
+        "status_sk": f"{round_number}#{sk}",
+    }
+
+# Ask DynamoDB to send nothing back on writes; the defaults are already
+# NONE, but being explicit keeps response metadata off the wire on every
+# write path.
+_NO_RETURN_METADATA = {
+    "ReturnValues": "NONE",
+    "ReturnConsumedCapacity": "NONE",
+    "ReturnItemCollectionMetrics": "NONE",
+}
+
+# Keep sockets warm between tool calls: TCP keepalive plus a pool large
+# enough that concurrent calls never pay a fresh TLS handshake.
+_BOTO_CONFIG = botocore.config.Config(
+    tcp_keepalive=True,
+    max_pool_connections=50,
+    retries={"max_attempts": 5, "mode": "adaptive"},
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _dynamodb_resource(region_name: Optional[str] = None):
+    """
+    One shared DynamoDB resource per region. Caching this keeps a single
+    urllib3 connection pool alive across all repositories instead of paying
+    connection setup on every request.
+    """
+    session = boto3.session.Session()
+    return session.resource("dynamodb", region_name=region_name, config=_BOTO_CONFIG)
 
 
 class DynamoRepository:
@@ -18,45 +64,99 @@ class DynamoRepository:
 
     def __init__(self, table_name: str, pk_value: str):
         self.pk = pk_value
-        self.db = boto3.resource("dynamodb")
+        self.db = _dynamodb_resource()
         self.table = self.db.Table(table_name)
+        # Bind the table methods once; boto3 resolves resource actions via
+        # dynamic attribute lookup, which is needless work on every call.
+        self._get_item = self.table.get_item
+        self._put_item = self.table.put_item
+        self._update_item = self.table.update_item
+        self._delete_item = self.table.delete_item
+        self._query = self.table.query
+        # Condition expression trees are immutable, so build each one once
+        # per repository instead of on every query.
+        self._pk_condition = Key("PK").eq(pk_value)
+        self._key_condition_cache: Dict[str, Any] = {}
+
+    def _sk_prefix_condition(self, prefix: str):
+        """Cached `PK = :pk AND begins_with(SK, prefix)` condition."""
+        condition = self._key_condition_cache.get(prefix)
+        if condition is None:
+            condition = self._pk_condition & Key("SK").begins_with(prefix)
+            self._key_condition_cache[prefix] = condition
+        return condition
 
     def get_config(self) -> Dict[str, Any]:
         """Fetches the CONFIG item for the current tournament."""
         try:
-            result = self.table.get_item(Key={"PK": self.pk, "SK": CONFIG_SK})
+            result = self._get_item(
+                Key={"PK": self.pk, "SK": CONFIG_SK}, ConsistentRead=False
+            )
             return result.get("Item", {})
-        except Exception as e:
-            print(f"Error fetching config: {e}", file=sys.stderr)
+        except Exception:
+            logger.exception("Error fetching config")
             return {}
 
-    def update_config(self, update_expr: str, expr_values: Dict[str, Any]) -> bool:
-        """Updates the CONFIG item for the current tournament."""
+    def update_config(
+        self,
+        update_expr: str,
+        expr_values: Dict[str, Any],
+        condition_expr: Optional[str] = None,
+    ) -> bool:
+        """
+        Updates the CONFIG item for the current tournament. A failed
+        ConditionExpression counts as success: the item already holds the
+        requested value, so there is nothing to write.
+        """
         try:
-            self.table.update_item(
-                Key={"PK": self.pk, "SK": CONFIG_SK},
-                UpdateExpression=update_expr,
-                ExpressionAttributeValues=expr_values,
-            )
+            params = {
+                "Key": {"PK": self.pk, "SK": CONFIG_SK},
+                "UpdateExpression": update_expr,
+                "ExpressionAttributeValues": expr_values,
+                **_NO_RETURN_METADATA,
+            }
+            if condition_expr:
+                params["ConditionExpression"] = condition_expr
+            self._update_item(**params)
             return True
-        except Exception as e:
-            print(f"Error updating config: {e}", file=sys.stderr)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return True
+            logger.exception("Error updating config")
+            return False
+        except Exception:
+            logger.exception("Error updating config")
             return False
 
 
+    def _query_all_pages(self, **query_params) -> List[Dict[str, Any]]:
+        """
+        Runs a Query and follows LastEvaluatedKey until the result set is
+        complete. A single Query caps out at 1 MB; without this, large
+        tournaments would silently lose players and matches.
+        """
+        # Standings tolerate eventual consistency, and it halves read cost.
+        query_params.setdefault("ConsistentRead", False)
+        items: List[Dict[str, Any]] = []
+        while True:
+            response = self._query(**query_params)
+            items.extend(response.get("Items", []))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return items
+            query_params["ExclusiveStartKey"] = last_key
+
     def _get_items_by_type(self, item_type: str) -> List[Dict[str, Any]]:
         """
         Fetches items of a specific type (PLAYER#, MATCH#, etc.)
         for the current tournament.
         """
         try:
-            response = self.table.query(
-                KeyConditionExpression=Key("PK").eq(self.pk)
-                & Key("SK").begins_with(f"{item_type}#")
+            return self._query_all_pages(
+                KeyConditionExpression=self._sk_prefix_condition(f"{item_type}#")
             )
-            return response.get("Items", [])
-        except Exception as e:
-            print(f"Error querying {item_type} items: {e}", file=sys.stderr)
+        except Exception:
+            logger.exception("Error querying %s items", item_type)
             return []
 
     # Domain-Specific Fetchers
@@ -69,15 +169,51 @@ class DynamoRepository:
         """Returns all matches for this tournament."""
         return self._get_items_by_type("MATCH")
 
+    def get_matches_by_status(self, status: str) -> List[Dict[str, Any]]:
+        """
+        Returns matches with the given status via StatusIndex, so only the
+        matching items are read instead of every match in the partition.
+        """
+        status_pk = f"{self.pk}#{status}"
+        condition = self._key_condition_cache.get(status_pk)
+        if condition is None:
+            condition = Key("status_pk").eq(status_pk)
+            self._key_condition_cache[status_pk] = condition
+        try:
+            return self._query_all_pages(
+                IndexName=STATUS_INDEX_NAME,
+                KeyConditionExpression=condition,
+            )
+        except Exception:
+            logger.exception("Error querying %s matches", status)
+            return []
+
+    def get_completed_match_fingerprints(self) -> List[Dict[str, Any]]:
+        """
+        Returns just the four player-id attributes of COMPLETED matches.
+        The status filter runs server-side and the projection keeps the
+        payload to four short strings per match instead of the full item.
+        """
+        try:
+            return self._query_all_pages(
+                KeyConditionExpression=self._sk_prefix_condition("MATCH#"),
+                FilterExpression=Attr("status").eq("COMPLETED"),
+                ProjectionExpression="tA_p1_id,tA_p2_id,tB_p1_id,tB_p2_id",
+            )
+        except Exception:
+            logger.exception("Error querying match fingerprints")
+            return []
+
     def get_match(self, match_id: str) -> Optional[Dict[str, Any]]:
         """Fetches one match by ID."""
         try:
-            result = self.table.get_item(
-                Key={"PK": self.pk, "SK": f"MATCH#{match_id}"}
+            result = self._get_item(
+                Key={"PK": self.pk, "SK": f"MATCH#{match_id}"},
+                ConsistentRead=False,
             )
             return result.get("Item")
-        except Exception as e:
-            print(f"Error getting match {match_id}: {e}", file=sys.stderr)
+        except Exception:
+            logger.exception("Error getting match %s", match_id)
             return None
 
     # Write Operations
@@ -85,10 +221,24 @@ class DynamoRepository:
     def put_item(self, item: Dict[str, Any]) -> bool:
         """Inserts or replaces an item (player, match, or config)."""
         try:
-            self.table.put_item(Item=item)
+            self._put_item(Item=item, **_NO_RETURN_METADATA)
             return True
-        except Exception as e:
-            print(f"Error putting item: {e}", file=sys.stderr)
+        except Exception:
+            logger.exception("Error putting item")
+            return False
+
+    def batch_put_items(self, items: List[Dict[str, Any]]) -> bool:
+        """
+        Inserts many items with BatchWriteItem. The batch_writer chunks to
+        25 items per call and retries UnprocessedItems automatically.
+        """
+        try:
+            with self.table.batch_writer() as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+            return True
+        except Exception:
+            logger.exception("Error batch-putting items")
             return False
 
     def update_item(
@@ -108,28 +258,62 @@ class DynamoRepository:
                 params["ExpressionAttributeNames"] = expression_names
             if expression_values:
                 params["ExpressionAttributeValues"] = expression_values
-            self.table.update_item(**params)
+            params.update(_NO_RETURN_METADATA)
+            self._update_item(**params)
+            return True
+        except Exception:
+            logger.exception("Error updating item")
+            return False
+
+    def transact_write(self, items: List[Dict[str, Any]]) -> bool:
+        """
+        Executes up to 100 writes atomically via TransactWriteItems.
+        Each entry looks like {"Update": {...}} with plain Python values;
+        TableName is filled in and keys/values are serialized to the
+        low-level format the client expects.
+        """
+        serializer = TypeSerializer()
+        try:
+            transact_items = []
+            for entry in items:
+                (action, op), = entry.items()
+                op = dict(op)
+                op["TableName"] = self.table.name
+                if "Key" in op:
+                    op["Key"] = {
+                        k: serializer.serialize(v) for k, v in op["Key"].items()
+                    }
+                if "ExpressionAttributeValues" in op:
+                    op["ExpressionAttributeValues"] = {
+                        k: serializer.serialize(v)
+                        for k, v in op["ExpressionAttributeValues"].items()
+                    }
+                transact_items.append({action: op})
+            self.db.meta.client.transact_write_items(
+                TransactItems=transact_items,
+                ReturnConsumedCapacity="NONE",
+                ReturnItemCollectionMetrics="NONE",
+            )
             return True
-        except Exception as e:
-            print(f"Error updating item: {e}", file=sys.stderr)
+        except Exception:
+            logger.exception("Error in transactional write")
             return False
 
     def delete_item(self, key: Dict[str, Any]) -> bool:
         """Deletes an item (player, match, or config) by full key."""
         try:
-            self.table.delete_item(Key=key)
+            self._delete_item(Key=key, **_NO_RETURN_METADATA)
             return True
-        except Exception as e:
-            print(f"Error deleting item: {e}", file=sys.stderr)
+        except Exception:
+            logger.exception("Error deleting item")
             return False
 
     def query_items_by_pk(self) -> List[Dict[str, Any]]:
         """Fetches all items for the current PK (tournament)."""
         try:
-            response = self.table.query(KeyConditionExpression=Key("PK").eq(self.pk))
-            return response.get("Items", [])
-        except Exception as e:
-            print(f"Error querying items by PK: {e}", file=sys.stderr)
+            return self._query_all_pages(KeyConditionExpression=self._pk_condition)
+        except Exception:
+            logger.exception("Error querying items by PK")
             return []
 
 
@@ -143,36 +327,48 @@ def setup_dynamodb_table(table_name: str):
     client = boto3.client("dynamodb")
     try:
         client.describe_table(TableName=table_name)
-        print(f"DynamoDB table '{table_name}' already exists.", file=sys.stderr)
+        logger.info("DynamoDB table '%s' already exists.", table_name)
     except ClientError as e:
         if e.response["Error"]["Code"] == "ResourceNotFoundException":
-            print(f"Creating table '{table_name}'...", file=sys.stderr)
+            logger.info("Creating table '%s'...", table_name)
             try:
                 client.create_table(
                     TableName=table_name,
                     AttributeDefinitions=[
                         {"AttributeName": "PK", "AttributeType": "S"},
                         {"AttributeName": "SK", "AttributeType": "S"},
+                        {"AttributeName": "status_pk", "AttributeType": "S"},
+                        {"AttributeName": "status_sk", "AttributeType": "S"},
                     ],
                     KeySchema=[
                         {"AttributeName": "PK", "KeyType": "HASH"},
                         {"AttributeName": "SK", "KeyType": "RANGE"},
                     ],
+                    GlobalSecondaryIndexes=[
+                        {
+                            "IndexName": STATUS_INDEX_NAME,
+                            "KeySchema": [
+                                {"AttributeName": "status_pk", "KeyType": "HASH"},
+                                {"AttributeName": "status_sk", "KeyType": "RANGE"},
+                            ],
+                            "Projection": {"ProjectionType": "ALL"},
+                        },
+                    ],
                     BillingMode="PAY_PER_REQUEST",  # On-Demand pricing model
                     # ProvisionedThroughput={
                     #     "ReadCapacityUnits": 5,
                     #     "WriteCapacityUnits": 5,
                     # },
                 )
-                print(f"Waiting for table '{table_name}' to become active...", file=sys.stderr)
+                logger.info("Waiting for table '%s' to become active...", table_name)
                 client.get_waiter("table_exists").wait(TableName=table_name)
-                print(f"Table '{table_name}' created successfully.", file=sys.stderr)
+                logger.info("Table '%s' created successfully.", table_name)
             except Exception as ce:
-                print(f"FATAL: Could not create table. Error: {ce}", file=sys.stderr)
+                logger.critical("FATAL: Could not create table. Error: %s", ce)
                 sys.exit(1)
         else:
-            print(f"FATAL: Error describing table: {e}", file=sys.stderr)
+            logger.critical("FATAL: Error describing table: %s", e)
             raise e
     except Exception as e:
-        print(f"FATAL: DynamoDB setup error: {e}", file=sys.stderr)
+        logger.critical("FATAL: DynamoDB setup error: %s", e)
         sys.exit(1)
\ No newline at end of file
@@ -1,19 +1,95 @@
+import atexit
+import collections
+import io
+import logging
+import logging.handlers
+import queue
 import sys
+import threading
 import uuid
 import random
 import os
+import functools
+import operator
+import anyio.to_thread
 from fastmcp import FastMCP
 from typing import List, Dict, Any, Optional, Tuple, Set
 from db_repository import (
     DynamoRepository,
     setup_dynamodb_table,
+    status_index_attrs,
+    CONFIG_SK,
     DYNAMO_TABLE_NAME
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _configure_logging() -> None:
+    """
+    Routes all log records through a queue drained by a background
+    listener, so emitting a record never blocks a tool thread on stderr
+    I/O.
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    listener = logging.handlers.QueueListener(
+        log_queue, stderr_handler, respect_handler_level=True
+    )
+    listener.start()
+    # Drain whatever is still queued on shutdown — sys.exit right after a
+    # logger.critical must not swallow the record.
+    atexit.register(listener.stop)
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+
+
 # Default values
 DEFAULT_MAX_COURTS = 3
 DEFAULT_PAIRING_MODE = "BALANCED"
 
+# How many candidate shuffles RANDOM pairing samples when avoiding rematches.
+RANDOM_PAIRING_CANDIDATES = 32
+
+# Player wins/losses/score travel as one packed number attribute ('stats')
+# to keep items small: wins*1_000_000 + losses*1_000 + score. Each field
+# stays well under 1000 for any realistic tournament.
+STATS_WIN_UNIT = 1_000_000
+STATS_LOSS_UNIT = 1_000
+
+
+# Pre-generated UUID4s, refilled in one os.urandom read per batch so id
+# generation on the hot path never waits on a per-call entropy syscall.
+_ID_POOL_BATCH = 256
+_id_pool: collections.deque = collections.deque()
+_id_pool_lock = threading.Lock()
+
+
+def _next_id() -> uuid.UUID:
+    with _id_pool_lock:
+        if not _id_pool:
+            entropy = os.urandom(16 * _ID_POOL_BATCH)
+            _id_pool.extend(
+                uuid.UUID(bytes=entropy[i:i + 16], version=4)
+                for i in range(0, len(entropy), 16)
+            )
+        return _id_pool.popleft()
+
+
+def _pack_stats(wins: int, losses: int, score: int) -> int:
+    return wins * STATS_WIN_UNIT + losses * STATS_LOSS_UNIT + score
+
+
+def _unpack_stats(stats: Any) -> Tuple[int, int, int]:
+    stats = int(stats)
+    return (stats // STATS_WIN_UNIT,
+            (stats // STATS_LOSS_UNIT) % 1000,
+            stats % 1000)
+
 class TournamentService:
     """
     Handles all the business logic for a single tournament.
@@ -23,11 +99,61 @@ class TournamentService:
         self.repo = repo
         self.pk = pk_value
         self.tournament_id = tournament_id
-
+        # Lazily-loaded CONFIG item. A service lives for one tool call, so
+        # this caches the (otherwise repeated) GetItem for the request only.
+        self._config_cache: Optional[Dict[str, Any]] = None
+        # player_id -> compact index, assigned on first sight; used to pack
+        # foursome fingerprints into plain ints.
+        self._player_index: Dict[str, int] = {}
+        # When the service is used as a context manager, puts are buffered
+        # here and flushed in one BatchWriteItem on exit.
+        self._write_buffer: Optional[List[Dict[str, Any]]] = None
+
+    def __enter__(self) -> "TournamentService":
+        self._write_buffer = []
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        buffered, self._write_buffer = self._write_buffer, None
+        if exc_type is None and buffered:
+            self.repo.batch_put_items(buffered)
+        return False
+
+    def _put(self, item: Dict[str, Any]) -> bool:
+        if self._write_buffer is not None:
+            self._write_buffer.append(item)
+            return True
+        return self.repo.put_item(item)
+
+    def _foursome_key(self, player_ids) -> Optional[int]:
+        """
+        Packs a foursome into a single int: each player id maps to a
+        compact index, and the four sorted indices are concatenated 32
+        bits apart. Order-independent like a frozenset of the ids, but
+        far cheaper to build and hash. Returns None on missing ids.
+        """
+        indices = []
+        for pid in player_ids:
+            if not pid:
+                return None
+            idx = self._player_index.get(pid)
+            if idx is None:
+                idx = len(self._player_index)
+                self._player_index[pid] = idx
+            indices.append(idx)
+        indices.sort()
+        key = 0
+        for idx in indices:
+            key = (key << 32) | idx
+        return key
+
+    def _get_config(self) -> Dict[str, Any]:
+        if self._config_cache is None:
+            self._config_cache = self.repo.get_config()
+        return self._config_cache
 
     def get_config_value(self, key: str, default: Any) -> Any:
-        config = self.repo.get_config()
-        return config.get(key, default)
+        return self._get_config().get(key, default)
 
     def get_max_courts(self) -> int:
         return int(self.get_config_value('max_courts', DEFAULT_MAX_COURTS))
@@ -35,7 +161,14 @@ class TournamentService:
     def set_max_courts(self, total_courts: int) -> str:
         if total_courts < 0:
             return "Error: Total courts must be 0 or greater."
-        if self.repo.update_config("SET max_courts = :c", {':c': total_courts}):
+        # Agents often re-set the value already in place; skip the write.
+        # The condition keeps the write idempotent even if the cache is
+        # stale (a failed condition is treated as success).
+        if self.get_max_courts() == total_courts or self.repo.update_config(
+            "SET max_courts = :c", {':c': total_courts},
+            "attribute_not_exists(max_courts) OR max_courts <> :c",
+        ):
+            self._get_config()['max_courts'] = total_courts
             return f"Success: Court capacity set to {total_courts}."
         return "Error: Failed to set court capacity."
 
@@ -45,7 +178,11 @@ class TournamentService:
     def set_current_round(self, round_number: int) -> str:
         if round_number < 1:
             return "Error: Round number must be 1 or greater."
-        if self.repo.update_config("SET current_round = :r", {':r': round_number}):
+        if self.get_current_round() == round_number or self.repo.update_config(
+            "SET current_round = :r", {':r': round_number},
+            "attribute_not_exists(current_round) OR current_round <> :r",
+        ):
+            self._get_config()['current_round'] = round_number
             return f"Success: Current round set to {round_number}."
         return "Error: Failed to set round."
 
@@ -56,73 +193,147 @@ class TournamentService:
         mode = mode.upper()
         if mode not in ["RANDOM", "BALANCED"]:
             return "Error: Mode must be 'RANDOM' or 'BALANCED'."
-        if self.repo.update_config("SET pairing_mode = :m", {':m': mode}):
+        if self.get_pairing_mode() == mode or self.repo.update_config(
+            "SET pairing_mode = :m", {':m': mode},
+            "attribute_not_exists(pairing_mode) OR pairing_mode <> :m",
+        ):
+            self._get_config()['pairing_mode'] = mode
             return f"Success: Pairing mode set to {mode}."
         return "Error: Failed to set pairing mode."
 
     # Player & Match Logic
 
-    def get_players(self) -> List[Dict[str, Any]]:
-        players = self.repo.get_players()
-        players.sort(key=lambda p: (p.get('score', 0), p.get('wins', 0)), reverse=True)
+    def load_snapshot(self) -> Dict[str, Any]:
+        """
+        Fetches the whole tournament partition in one Query and splits it
+        into config, players, and matches. Methods that need more than one
+        of these should work off the snapshot instead of re-querying.
+        """
+        config: Dict[str, Any] = {}
+        players: List[Dict[str, Any]] = []
+        matches: List[Dict[str, Any]] = []
+        for item in self.repo.query_items_by_pk():
+            sk = item.get('SK', '')
+            if sk.startswith("PLAYER#"):
+                players.append(item)
+            elif sk.startswith("MATCH#"):
+                matches.append(item)
+            elif sk == "CONFIG":
+                config = item
+        self._config_cache = config
+        return {'config': config, 'players': players, 'matches': matches}
+
+    def get_players(self, players: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        players = list(players) if players is not None else self.repo.get_players()
+        for p in players:
+            p['wins'], p['losses'], p['score'] = _unpack_stats(p.get('stats', 0))
+        players.sort(key=operator.itemgetter('score', 'wins'), reverse=True)
         return players
 
-    def get_matches(self, status: str) -> List[Dict[str, Any]]:
-        all_matches = self.repo.get_matches()
-        all_matches.sort(key=lambda m: (m.get('round_number', 999), m.get('SK', '')))
-        return [m for m in all_matches if m.get('status') == status]
-
-    def _get_available_players(self) -> List[Dict[str, Any]]:
-        all_players = self.get_players()
-        active_matches = self.get_matches("ACTIVE")
-        pending_matches = self.get_matches("PENDING")
-        busy_player_ids = set()
-
-        for match in active_matches + pending_matches:
-            players_in_match = [
-                match.get('tA_p1_id'), match.get('tA_p2_id'),
-                match.get('tB_p1_id'), match.get('tB_p2_id')
-            ]
-            for pid in players_in_match:
-                if pid:
-                    busy_player_ids.add(pid)
+    def get_matches(self, status: str,
+                    matches: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        if matches is not None:
+            matched = [m for m in matches if m.get('status') == status]
+        else:
+            matched = self.repo.get_matches_by_status(status)
+        matched.sort(key=operator.itemgetter('round_number', 'SK'))
+        return matched
+
+    def _get_available_players(self, snapshot: Dict[str, Any]) -> List[Dict[str, Any]]:
+        all_players = self.get_players(snapshot['players'])
+        busy_player_ids = {
+            pid
+            for match in snapshot['matches']
+            if match.get('status') in ("ACTIVE", "PENDING")
+            for pid in (match.get('tA_p1_id'), match.get('tA_p2_id'),
+                        match.get('tB_p1_id'), match.get('tB_p2_id'))
+            if pid
+        }
         return [p for p in all_players if p['player_id'] not in busy_player_ids]
 
-    def _get_rematch_fingerprints(self) -> Set[frozenset]:
+    def _get_rematch_fingerprints(
+        self, matches: Optional[List[Dict[str, Any]]] = None
+    ) -> Set[int]:
         fingerprints = set()
-        completed_matches = self.get_matches("COMPLETED")
+        if matches is not None:
+            completed_matches = self.get_matches("COMPLETED", matches)
+        else:
+            # No snapshot in hand: fetch only the four player-id attributes.
+            completed_matches = self.repo.get_completed_match_fingerprints()
         for m in completed_matches:
-            p_ids = frozenset([
+            key = self._foursome_key((
                 m.get('tA_p1_id'), m.get('tA_p2_id'),
                 m.get('tB_p1_id'), m.get('tB_p2_id')
-            ])
-            if None not in p_ids:
-                fingerprints.add(p_ids)
+            ))
+            if key is not None:
+                fingerprints.add(key)
         return fingerprints
 
     # core Tournament Logic
 
-    def add_player(self, name: str, level: int) -> str:
-        if not 1 <= level <= 5:
-            return "Error: Level must be between 1 and 5."
-        player_id = str(uuid.uuid4())
-        item = {
+    def _player_item(self, name: str, level: int) -> Dict[str, Any]:
+        player_id = str(_next_id())
+        return {
             'PK': self.pk,
             'SK': f"PLAYER#{player_id}",
             'player_id': player_id,
             'name': name,
             'level': level,
-            'wins': 0,
-            'losses': 0,
-            'score': 0,
+            'stats': 0,
         }
-        if self.repo.put_item(item):
-            return f"Player '{name}' (Level {level}) added with ID {player_id}."
+
+    def add_player(self, name: str, level: int) -> str:
+        if not 1 <= level <= 5:
+            return "Error: Level must be between 1 and 5."
+        item = self._player_item(name, level)
+        if self._put(item):
+            return f"Player '{name}' (Level {level}) added with ID {item['player_id']}."
         return "Error: Failed to add player."
 
-    def _create_random_foursomes(self, players: List[Dict]) -> List[Tuple]:
-        random.shuffle(players)
-        return [tuple(players[i:i+4]) for i in range(0, len(players) - 3, 4)]
+    def add_players_bulk(self, players: List[Dict[str, Any]]) -> str:
+        items = []
+        for entry in players:
+            name = entry.get('name')
+            level = int(entry.get('level', 3))
+            if not name:
+                return "Error: Every player entry needs a name."
+            if not 1 <= level <= 5:
+                return f"Error: Level for '{name}' must be between 1 and 5."
+            items.append(self._player_item(name, level))
+        if not items:
+            return "Error: No players provided."
+        if self.repo.batch_put_items(items):
+            names = ', '.join(item['name'] for item in items)
+            return f"Added {len(items)} players: {names}."
+        return "Error: Failed to add players."
+
+    def _create_random_foursomes(self, players: List[Dict],
+                                 played_matchups: Optional[Set[int]] = None) -> List[Tuple]:
+        """
+        Shuffles players into foursomes. When rematch fingerprints are
+        supplied, samples several candidate shuffles and keeps the one
+        with the fewest rematches instead of settling for the first draw.
+        """
+        def foursomes_of(order: List[Dict]) -> List[Tuple]:
+            return [tuple(order[i:i+4]) for i in range(0, len(order) - 3, 4)]
+
+        if not played_matchups:
+            random.shuffle(players)
+            return foursomes_of(players)
+
+        best_foursomes: List[Tuple] = []
+        best_rematches = None
+        for _ in range(RANDOM_PAIRING_CANDIDATES):
+            candidate = foursomes_of(random.sample(players, len(players)))
+            rematches = sum(
+                1 for foursome in candidate
+                if self._foursome_key(p['player_id'] for p in foursome) in played_matchups
+            )
+            if best_rematches is None or rematches < best_rematches:
+                best_foursomes, best_rematches = candidate, rematches
+            if best_rematches == 0:
+                break
+        return best_foursomes
 
     def _create_balanced_foursomes(self, players: List[Dict]) -> List[Tuple]:
         players.sort(key=lambda p: p.get('level', 3), reverse=True)
@@ -137,8 +348,10 @@ class TournamentService:
                 for i in range(0, len(teams) - 1, 2)]
 
     def create_doubles_matches(self) -> str:
-        pairing_mode = self.get_pairing_mode()
-        players = self._get_available_players()
+        snapshot = self.load_snapshot()
+        config = snapshot['config']
+        pairing_mode = config.get('pairing_mode', DEFAULT_PAIRING_MODE)
+        players = self._get_available_players(snapshot)
 
         if len(players) < 4:
             return "Error: Not enough available players for a doubles match (need 4)."
@@ -150,22 +363,24 @@ class TournamentService:
             for _ in range(num_byes):
                 bye_player_names.append(players.pop(0)['name'])
 
+        current_round = int(config.get('current_round', 1))
+        played_matchups = self._get_rematch_fingerprints(snapshot['matches'])
+
         if pairing_mode == "RANDOM":
-            foursomes = self._create_random_foursomes(players)
+            foursomes = self._create_random_foursomes(players, played_matchups)
         else:
             foursomes = self._create_balanced_foursomes(players)
 
-        current_round = self.get_current_round()
-        played_matchups = self._get_rematch_fingerprints()
+        match_items = []
         new_matches_info = []
         warnings = []
 
         for (tA_p1, tA_p2, tB_p1, tB_p2) in foursomes:
-            match_id = str(uuid.uuid4())
-            fingerprint = frozenset([
+            match_id = str(_next_id())
+            fingerprint = self._foursome_key((
                 tA_p1['player_id'], tA_p2['player_id'],
                 tB_p1['player_id'], tB_p2['player_id']
-            ])
+            ))
             is_rematch = (fingerprint in played_matchups)
             item = {
                 'PK': self.pk, 'SK': f"MATCH#{match_id}",
@@ -176,8 +391,9 @@ class TournamentService:
                 'tA_p2_id': tA_p2['player_id'], 'tA_p2_name': tA_p2['name'],
                 'tB_p1_id': tB_p1['player_id'], 'tB_p1_name': tB_p1['name'],
                 'tB_p2_id': tB_p2['player_id'], 'tB_p2_name': tB_p2['name'],
+                **status_index_attrs(self.pk, "PENDING", current_round, f"MATCH#{match_id}"),
             }
-            self.repo.put_item(item)
+            match_items.append(item)
             match_name = f"(D) {tA_p1['name']}/{tA_p2['name']} vs {tB_p1['name']}/{tB_p2['name']}"
             match_info = f"{match_name} (ID: {match_id}) - Round {current_round}"
             if is_rematch:
@@ -185,6 +401,9 @@ class TournamentService:
                 warnings.append(match_name)
             new_matches_info.append(match_info)
 
+        if not self.repo.batch_put_items(match_items):
+            return "Error: Failed to create matches."
+
         response = f"Created {len(new_matches_info)} matches ({pairing_mode} mode):\n" + "\n".join(new_matches_info)
         if warnings:
             response += f"\n\n⚠️ {len(warnings)} match(es) are rematches."
@@ -194,20 +413,49 @@ class TournamentService:
 
     def start_match(self, match_id: str) -> str:
         max_courts = self.get_max_courts()
-        active_matches = self.get_matches(status="ACTIVE")
-        if len(active_matches) >= max_courts:
+        # The counter condition below is a no-op while active_count is
+        # absent (pre-counter tournaments), so enforce the zero-courts
+        # case up front.
+        if max_courts < 1:
             return f"Error: All {max_courts} courts are full."
-
         match_item = self.repo.get_match(match_id)
         if not match_item:
             return f"Error: Match ID {match_id} not found."
         if match_item.get('status') != "PENDING":
             return f"Error: Match not in PENDING state."
 
-        key = {'PK': self.pk, 'SK': f"MATCH#{match_id}"}
-        if self.repo.update_item(key, "SET #st = :s", {"#st": "status"}, {':s': "ACTIVE"}):
+        gsi = status_index_attrs(self.pk, "ACTIVE",
+                                 match_item.get('round_number', 0), f"MATCH#{match_id}")
+        # Flip the match to ACTIVE and claim a court in one atomic
+        # transaction; concurrent starts can no longer overflow max_courts
+        # the way a separate count-then-write did.
+        transact_items = [
+            {
+                "Update": {
+                    "Key": {'PK': self.pk, 'SK': f"MATCH#{match_id}"},
+                    "UpdateExpression": ("SET #st = :active, "
+                                         "status_pk = :spk, status_sk = :ssk"),
+                    "ConditionExpression": "#st = :pending",
+                    "ExpressionAttributeNames": {'#st': 'status'},
+                    "ExpressionAttributeValues": {
+                        ':active': "ACTIVE", ':pending': "PENDING",
+                        ':spk': gsi['status_pk'], ':ssk': gsi['status_sk'],
+                    },
+                }
+            },
+            {
+                "Update": {
+                    "Key": {'PK': self.pk, 'SK': CONFIG_SK},
+                    "UpdateExpression": "ADD active_count :one",
+                    "ConditionExpression": ("attribute_not_exists(active_count) "
+                                            "OR active_count < :max"),
+                    "ExpressionAttributeValues": {':one': 1, ':max': max_courts},
+                }
+            },
+        ]
+        if self.repo.transact_write(transact_items):
             return f"Match started: {self._get_match_name(match_item)}"
-        return "Error: Could not start match."
+        return f"Error: Could not start match. All {max_courts} courts may be full."
 
     def report_score(self, match_id: str, teamA_score: int, teamB_score: int) -> str:
         match_item = self.repo.get_match(match_id)
@@ -231,15 +479,48 @@ class TournamentService:
         for pid in teamB:
             players_update.append((pid, lose_score, win_score))
 
-        match_key = {'PK': self.pk, 'SK': f"MATCH#{match_id}"}
-        match_vals = {':s': "COMPLETED", ':sA': teamA_score, ':sB': teamB_score}
-        self.repo.update_item(match_key, "SET #st = :s, teamA_score = :sA, teamB_score = :sB",
-                              {'#st': 'status'}, match_vals)
-
+        # Match + 4 player updates in one atomic round-trip; standings can
+        # never be left half-updated if the process dies mid-score.
+        gsi = status_index_attrs(self.pk, "COMPLETED",
+                                 match_item.get('round_number', 0), f"MATCH#{match_id}")
+        # The status condition makes concurrent reports of the same match
+        # mutually exclusive: the loser's transaction cancels instead of
+        # double-applying stat deltas and the court-counter decrement.
+        transact_items = [{
+            "Update": {
+                "Key": {'PK': self.pk, 'SK': f"MATCH#{match_id}"},
+                "UpdateExpression": ("SET #st = :s, teamA_score = :sA, teamB_score = :sB, "
+                                     "status_pk = :spk, status_sk = :ssk"),
+                "ConditionExpression": "#st = :cur",
+                "ExpressionAttributeNames": {'#st': 'status'},
+                "ExpressionAttributeValues": {
+                    ':s': "COMPLETED", ':sA': teamA_score, ':sB': teamB_score,
+                    ':cur': match_item.get('status'),
+                    ':spk': gsi['status_pk'], ':ssk': gsi['status_sk'],
+                },
+            }
+        }]
         for pid, w, l in players_update:
-            self.repo.update_item({'PK': self.pk, 'SK': f"PLAYER#{pid}"},
-                                  "ADD wins :w, losses :l, score :s",
-                                  None, {':w': int(w > l), ':l': int(l > w), ':s': w})
+            transact_items.append({
+                "Update": {
+                    "Key": {'PK': self.pk, 'SK': f"PLAYER#{pid}"},
+                    "UpdateExpression": "ADD stats :d",
+                    "ExpressionAttributeValues": {
+                        ':d': _pack_stats(int(w > l), int(l > w), w)
+                    },
+                }
+            })
+        if match_item.get('status') == "ACTIVE":
+            # Release the court claimed by start_match.
+            transact_items.append({
+                "Update": {
+                    "Key": {'PK': self.pk, 'SK': CONFIG_SK},
+                    "UpdateExpression": "ADD active_count :neg",
+                    "ExpressionAttributeValues": {':neg': -1},
+                }
+            })
+        if not self.repo.transact_write(transact_items):
+            return "Error: Failed to record score."
 
         match_name = self._get_match_name(match_item)
         if is_draw:
@@ -252,45 +533,49 @@ class TournamentService:
                 f"{match_item['tB_p1_name']}/{match_item['tB_p2_name']}")
 
     def get_standings_string(self) -> str:
-        players = self.get_players()
-        active = self.get_matches("ACTIVE")
-        pending = self.get_matches("PENDING")
-        max_courts = self.get_max_courts()
-        current_round = self.get_current_round()
-        mode = self.get_pairing_mode()
-
-        lines = [
-            f"Tournament: {self.tournament_id}",
-            f"Courts in use: {len(active)}/{max_courts}",
-            f"Current Round: {current_round}",
-            f"Pairing Mode: {mode}\n",
-            "## Player Standings",
-        ]
+        snapshot = self.load_snapshot()
+        config = snapshot['config']
+        players = self.get_players(snapshot['players'])
+        active = self.get_matches("ACTIVE", snapshot['matches'])
+        pending = self.get_matches("PENDING", snapshot['matches'])
+        max_courts = int(config.get('max_courts', DEFAULT_MAX_COURTS))
+        current_round = int(config.get('current_round', 1))
+        mode = config.get('pairing_mode', DEFAULT_PAIRING_MODE)
+
+        # Write straight into one buffer instead of collecting (and
+        # repeatedly resizing) a list of lines.
+        buf = io.StringIO()
+        buf.write(f"Tournament: {self.tournament_id}\n")
+        buf.write(f"Courts in use: {len(active)}/{max_courts}\n")
+        buf.write(f"Current Round: {current_round}\n")
+        buf.write(f"Pairing Mode: {mode}\n\n")
+        buf.write("## Player Standings\n")
         if not players:
-            lines.append("No players yet.")
+            buf.write("No players yet.")
         else:
-            lines.append("Rank | Name (Lvl) | Score | W-L")
-            lines.append("---- | ----------- | ------ | ----")
+            buf.write("Rank | Name (Lvl) | Score | W-L\n")
+            buf.write("---- | ----------- | ------ | ----")
             for i, p in enumerate(players, 1):
-                lines.append(f"{i} | {p['name']} (L{p['level']}) | {p['score']} | {p['wins']}-{p['losses']}")
+                buf.write(f"\n{i} | {p['name']} (L{p['level']}) | {p['score']} | {p['wins']}-{p['losses']}")
 
-        lines.append("\n## Active Matches")
+        buf.write("\n\n## Active Matches")
         if not active:
-            lines.append("None")
+            buf.write("\nNone")
         else:
             for m in active:
-                lines.append(f"- {self._get_match_name(m)} (R{m['round_number']})")
+                buf.write(f"\n- {self._get_match_name(m)} (R{m['round_number']})")
 
-        lines.append("\n## Pending Matches")
+        buf.write("\n\n## Pending Matches")
         if not pending:
-            lines.append("None")
+            buf.write("\nNone")
         else:
             for m in pending:
-                lines.append(f"- {self._get_match_name(m)} (R{m['round_number']})")
-        return "\n".join(lines)
+                buf.write(f"\n- {self._get_match_name(m)} (R{m['round_number']})")
+        return buf.getvalue()
 
 
 
+_configure_logging()
 setup_dynamodb_table(DYNAMO_TABLE_NAME)
 
 mcp = FastMCP(
@@ -300,22 +585,31 @@ mcp = FastMCP(
     )
 )
 
+@functools.lru_cache(maxsize=256)
+def _get_repo(pk_value: str) -> DynamoRepository:
+    """One repository (and Table binding) per tournament, reused across tool calls."""
+    return DynamoRepository(table_name=DYNAMO_TABLE_NAME, pk_value=pk_value)
+
+
 def get_service(tournament_id: str) -> TournamentService:
     pk_value = f"TOURNAMENT#{tournament_id}"
-    repo = DynamoRepository(table_name=DYNAMO_TABLE_NAME, pk_value=pk_value)
-    return TournamentService(repo, pk_value, tournament_id)
+    return TournamentService(_get_repo(pk_value), pk_value, tournament_id)
 
 
 # Tools
+#
+# Handlers are async so concurrent tool calls (e.g. from multiple
+# tournaments) do not serialize; the blocking boto3 work runs on anyio's
+# worker threads instead of the event loop.
 
 @mcp.tool()
-def create_tournament(tournament_name: Optional[str] = None, total_courts: int = 3):
+async def create_tournament(tournament_name: Optional[str] = None, total_courts: int = 3):
     """
     Creates a new tournament and initializes its config.
     """
-    tournament_id = f"T_{uuid.uuid4().hex[:8].upper()}"
+    tournament_id = f"T_{_next_id().hex[:8].upper()}"
     pk_value = f"TOURNAMENT#{tournament_id}"
-    repo = DynamoRepository(DYNAMO_TABLE_NAME, pk_value)
+    repo = _get_repo(pk_value)
 
     config_item = {
         'PK': pk_value,
@@ -324,52 +618,64 @@ def create_tournament(tournament_name: Optional[str] = None, total_courts: int =
         'max_courts': total_courts,
         'current_round': 1,
         'pairing_mode': 'BALANCED',
+        'active_count': 0,
     }
-    repo.put_item(config_item)
+    await anyio.to_thread.run_sync(repo.put_item, config_item)
     return f"Tournament created: {tournament_id} with {total_courts} courts."
 
 
 @mcp.tool()
-def add_player_to_tournament(tournament_id: str, name: str, level: int):
+async def add_player_to_tournament(tournament_id: str, name: str, level: int):
     service = get_service(tournament_id)
-    return service.add_player(name, level)
+    return await anyio.to_thread.run_sync(service.add_player, name, level)
 
 @mcp.tool()
-def set_court_capacity(tournament_id: str, total_courts: int):
+async def add_players_bulk(tournament_id: str, players: List[Dict[str, Any]]):
+    """
+    Adds a whole roster in one batched write. Each entry needs a 'name'
+    and may carry a 'level' (1-5, default 3).
+    """
     service = get_service(tournament_id)
-    return service.set_max_courts(total_courts)
+    return await anyio.to_thread.run_sync(service.add_players_bulk, players)
 
 @mcp.tool()
-def set_current_round(tournament_id: str, round_number: int):
+async def set_court_capacity(tournament_id: str, total_courts: int):
     service = get_service(tournament_id)
-    return service.set_current_round(round_number)
+    return await anyio.to_thread.run_sync(service.set_max_courts, total_courts)
 
 @mcp.tool()
-def set_pairing_mode(tournament_id: str, mode: str):
+async def set_current_round(tournament_id: str, round_number: int):
     service = get_service(tournament_id)
-    return service.set_pairing_mode(mode)
+    return await anyio.to_thread.run_sync(service.set_current_round, round_number)
 
 @mcp.tool()
-def create_doubles_matches(tournament_id: str):
+async def set_pairing_mode(tournament_id: str, mode: str):
     service = get_service(tournament_id)
-    return service.create_doubles_matches()
+    return await anyio.to_thread.run_sync(service.set_pairing_mode, mode)
 
 @mcp.tool()
-def start_match_on_court(tournament_id: str, match_id: str):
+async def create_doubles_matches(tournament_id: str):
     service = get_service(tournament_id)
-    return service.start_match(match_id)
+    return await anyio.to_thread.run_sync(service.create_doubles_matches)
 
 @mcp.tool()
-def report_match_score(tournament_id: str, match_id: str, teamA_score: int, teamB_score: int):
+async def start_match_on_court(tournament_id: str, match_id: str):
     service = get_service(tournament_id)
-    return service.report_score(match_id, teamA_score, teamB_score)
+    return await anyio.to_thread.run_sync(service.start_match, match_id)
+
+@mcp.tool()
+async def report_match_score(tournament_id: str, match_id: str, teamA_score: int, teamB_score: int):
+    service = get_service(tournament_id)
+    return await anyio.to_thread.run_sync(
+        service.report_score, match_id, teamA_score, teamB_score
+    )
 
 @mcp.tool()
-def get_standings(tournament_id: str):
+async def get_standings(tournament_id: str):
     service = get_service(tournament_id)
-    return service.get_standings_string()
+    return await anyio.to_thread.run_sync(service.get_standings_string)
 
 
 if __name__ == "__main__":
-    print("MCP Server Running (Multi-Tournament Mode)", file=sys.stderr)
+    logger.info("MCP Server Running (Multi-Tournament Mode)")
     mcp.run(transport='stdio')
\ No newline at end of file